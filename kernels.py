@@ -0,0 +1,30 @@
+# =========================
+# NoiseShield AI · Numeric Kernels
+# =========================
+# Kept out of app.py: Streamlit re-executes the script on every rerun, which would
+# rebuild the Numba dispatchers each time. An imported module keeps them compiled.
+import numpy as np
+
+try:   # numba is optional (requirements.txt installs it only where a wheel exists); else plain numpy
+    from numba import njit
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+    def njit(*a,**k): return lambda f:f
+
+INV_2SIGMA2=1/(2*0.0025)   # Gaussian agreement weight exp(-(p-m)²/(2σ²)), σ²=0.0025; numba folds it as a constant
+
+
+@njit(cache=True,fastmath=True)
+def sigmoid(z):   # overflow-safe: exp only ever sees -|z|
+    e=np.exp(-np.abs(z));return np.where(z>=0,1/(1+e),e/(1+e))
+@njit(cache=True,fastmath=True)
+def interfere_core(p):
+    m=p.mean();d=p-m;var=(d*d).mean()
+    w=np.exp(-(d*d)*INV_2SIGMA2)
+    if var>0.02: w=np.ones_like(w)
+    w/=w.sum();return (w*p).sum(),w,var
+@njit(cache=True,fastmath=True)
+def ensemble_core(x,w,b,s):   # w, b: scaler already folded in (LinearModel.w_eff / b_eff)
+    p=sigmoid(((w*x).sum()+b)*s)
+    pe,w,var=interfere_core(p);return pe,p,w,var
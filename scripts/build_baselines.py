@@ -0,0 +1,50 @@
+# =========================
+# NoiseShield AI · Offline Baseline Build
+# =========================
+# Trains the three logistic baselines on seeded synthetic data and writes their
+# parameters to baselines.npz, which app.py loads at startup.
+# Usage: python scripts/build_baselines.py
+import os
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import make_pipeline
+
+OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "baselines.npz")
+
+
+# ---------- Synthetic Training ----------
+def seed_rng(s=42): return np.random.default_rng(s)
+def synth_health_data(n=400,seed=1):
+    r=seed_rng(seed);X=np.empty((n,5))   # Hb, WBC, PLT, Temp, Pulse
+    X[:,0]=np.clip(r.normal(13,2.2,n),6,20);X[:,1]=np.clip(r.normal(7000,2500,n),2e3,3e4)
+    X[:,2]=np.clip(r.normal(250000,80000,n),7e4,8e5)
+    X[:,3]=np.clip(r.normal(36.8,0.7,n),34.5,41.5);X[:,4]=np.clip(r.normal(80,15,n),45,160)
+    y=((X[:,0]<11)|((X[:,3]>37.8)&(X[:,1]>10000))|(X[:,2]<120000)).astype(int);return X,y
+def synth_water_data(n=400,seed=2):
+    r=seed_rng(seed);X=np.empty((n,5))   # pH, turbidity, TDS, EC, temp
+    X[:,0]=np.clip(r.normal(7.1,0.6,n),4.5,9.5)
+    X[:,1]=np.clip(np.abs(r.normal(5,15,n)),0,200);X[:,2]=np.clip(np.abs(r.normal(300,250,n)),50,2500)
+    X[:,3]=np.clip(np.abs(r.normal(600,400,n)),50,4500);X[:,4]=np.clip(r.normal(24,6,n),5,45)
+    y=((X[:,1]>10)|(X[:,2]>1000)|(X[:,3]>2000)|(X[:,0]<6)|(X[:,0]>8.5)).astype(int);return X,y
+def synth_soil_data(n=400,seed=3):
+    r=seed_rng(seed);X=np.empty((n,5))   # pH, N, P, K, moisture
+    X[:,0]=np.clip(r.normal(6.5,0.8,n),3.5,9.5);X[:,1]=np.clip(r.normal(50,25,n),0,200)
+    X[:,2]=np.clip(r.normal(40,20,n),0,200);X[:,3]=np.clip(r.normal(150,60,n),0,300);X[:,4]=np.clip(r.normal(30,15,n),0,100)
+    y=((X[:,1]<30)|(X[:,2]<20)|(X[:,3]<80)|(X[:,0]<5.5)|(X[:,0]>8.5)).astype(int);return X,y
+def train_baselines():
+    fit=lambda X,y:make_pipeline(StandardScaler(),LogisticRegression(max_iter=500)).fit(X,y)
+    return fit(*synth_soil_data()),fit(*synth_health_data()),fit(*synth_water_data())
+
+# ---------- Export ----------
+def pipe_params(name,pipe):
+    sc=pipe.named_steps['standardscaler'];lr=pipe.named_steps['logisticregression']
+    arrs={"W":lr.coef_,"b":lr.intercept_,"mean":sc.mean_,"scale":sc.scale_}
+    return {f"{name}_{k}":v.astype(np.float32) for k,v in arrs.items()}   # app serves in float32
+def build_baselines(path=OUT):
+    arrs={}
+    for name,pipe in zip(("soil","health","water"),train_baselines()): arrs.update(pipe_params(name,pipe))
+    np.savez(path,**arrs);return arrs
+
+if __name__ == "__main__":
+    build_baselines();print(f"wrote {os.path.normpath(OUT)}")